@@ -0,0 +1,271 @@
+import asyncio
+import httpx
+import random
+import time
+from email.utils import parsedate_to_datetime
+from src.business_central_api_client import BusinessCentralClientMixin, _loads
+
+class AsyncBusinessCentralAPIClient(BusinessCentralClientMixin):
+    """
+    Asynchronous sibling of BusinessCentralAPIClient built on httpx.AsyncClient with HTTP/2 enabled.
+
+    It exposes the same read methods as coroutines, so requests against different tables can be awaited together
+    (for example with asyncio.gather) instead of one after the other. OAuth2.0 token handling, the MSAL token cache,
+    the construction of query parameters and the retry policy for throttled (429) and failed (5xx) requests
+    are shared with BusinessCentralAPIClient through BusinessCentralClientMixin.
+
+    Attributes:
+
+        tenant_id (str) : Azure tenant ID.
+        environment (str) : name of the Business Central Environment.
+        company (str) : name of the company within the environment.
+        client_id (str) : the client id of your registered Azure App.
+        client_secret (str) : the client secret of your registered Azure App.
+        scopes (list) : API scopes, set by default to business central API scopes but including other Microsoft REST APIS are allowed.
+        base_url (str) : the base URL of the Business Central API.
+        authority (str) : the authority URL required to obtain oauth token.
+        access_token (str) : OAuth2.0 access token for the client, automatically retrieved when an object is initialized.
+        token_type (str) : token type, automatically retrieved when an object is initialized.
+        token_cache_path (str) : path of the file used to persist the MSAL token cache across processes (optional).
+        timeout (float) : timeout in seconds applied to every request to the Business Central API (optional).
+        max_query_cost (int) : highest estimated cost accepted for a 'GET' request, see estimate_query_cost (optional).
+        headers (httpx.Headers) : the base headers for every request to the Business Central API.
+    """
+
+    def __init__(self,
+                 tenant_id,
+                 environment,
+                 company,
+                 client_id,
+                 client_secret,
+                 scopes=['https://api.businesscentral.dynamics.com/.default'],
+                 token_cache_path=None,
+                 timeout=None,
+                 http2=True,
+                 max_query_cost=None
+                 ):
+        """
+        Initializes the API Client with the necessary credentials and base URL.
+
+        Args:
+            tenant_id (str): Azure tenant ID.
+            environment (str): Name of the Business Central Environment.
+            company (str): Name of the company within the environment.
+            client_id (str): The client ID of your registered Azure App.
+            client_secret (str): The client secret of your registered Azure App.
+            token_cache_path (str): File where the MSAL token cache is persisted, so tokens are reused across processes. (optional)
+            timeout (float): Seconds to wait for the Business Central API before giving up, waits indefinitely by default. (optional)
+            http2 (bool): Whether to negotiate HTTP/2 with the Business Central API, requires the httpx[http2] extra. (optional)
+            max_query_cost (int): 'GET' requests whose estimated cost is higher raise QueryTooExpensiveError, no limit by default. (optional)
+        """
+
+        self._init_client(tenant_id, environment, company, client_id, client_secret, scopes, token_cache_path, timeout, max_query_cost)
+        self._http = httpx.AsyncClient(
+            http2=http2,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.CONNECTION_POOL_SIZE,
+                max_keepalive_connections=self.CONNECTION_POOL_SIZE
+            ),
+            headers={
+                'Accept': 'application/json',
+                'Content-Type': 'application/x-www-form-urlencoded'
+            }
+        )
+        self.headers = self._http.headers
+        self.get_oauth_token()
+
+    async def __aenter__(self):
+
+        return self
+
+    async def __aexit__(self, *exc_info):
+
+        await self.aclose()
+
+    async def aclose(self):
+
+        """
+        Closes the underlying httpx.AsyncClient and its pooled connections.
+        """
+
+        await self._http.aclose()
+
+    async def _send(self, method, url, params=None):
+
+        """
+        Sends a request, retrying up to RETRY_TOTAL times on RETRY_STATUSES. Waits as long as the Retry-After header asks,
+        or otherwise backs off exponentially with RETRY_BACKOFF_FACTOR plus up to RETRY_BACKOFF_JITTER seconds of jitter.
+        """
+
+        for attempt in range(self.RETRY_TOTAL + 1):
+
+            response = await self._http.request(method, url, params=params)
+
+            if response.status_code not in self.RETRY_STATUSES or attempt == self.RETRY_TOTAL:
+
+                return response
+
+            await asyncio.sleep(self._retry_delay(response, attempt))
+
+    def _retry_delay(self, response, attempt):
+
+        """
+        Returns the seconds to wait before retrying response, honoring its Retry-After header when present.
+        """
+
+        retry_after = response.headers.get('Retry-After')
+
+        if retry_after:
+
+            try:
+
+                return max(0.0, float(retry_after))
+
+            except ValueError:
+
+                try:
+
+                    return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+
+                except (TypeError, ValueError):
+
+                    pass
+
+        return self.RETRY_BACKOFF_FACTOR * (2 ** attempt) + random.uniform(0, self.RETRY_BACKOFF_JITTER)
+
+    async def request(self, url, method, params=None):
+
+        """
+        Asynchronous version of BusinessCentralAPIClient.request, handling automatic OAuth2.0 token refresh and
+        pagination for 'GET' requests using @OData.nextLink annotation as per OData standard.
+
+        With CONCURRENT_PAGINATION enabled and a server paginating with $skip, the remaining pages are awaited together,
+        at most PAGINATION_WORKERS at a time; otherwise the @OData.nextLink chain is followed page by page.
+        """
+
+        endpoint = self._endpoints.get(url) or self._endpoint_url(url)
+
+        if method == 'GET':
+
+            params = {'$count' : 'true', **(params or {})} if self.CONCURRENT_PAGINATION else (params or {})
+            self.check_query_cost(url, params)
+
+        if not self.token_is_valid():
+
+            await asyncio.to_thread(self.get_oauth_token)
+
+        response = await self._send(method, endpoint, params=params)
+
+        if response.status_code == 401:
+
+            await asyncio.to_thread(self.refresh_oauth_token)
+
+            response = await self._send(method, endpoint, params=params)
+
+        response.raise_for_status()
+
+        if method == 'GET':
+
+            first_page = _loads(response.content)
+            page_offsets = self._page_offsets(first_page, params)
+
+            if page_offsets:
+
+                records = await self._request_pages_concurrently(endpoint, params, page_offsets)
+
+                if records is not None:
+
+                    return first_page['value'] + records
+
+            return await self._request_pages_serially(first_page)
+
+        return _loads(response.content)
+
+    async def _request_pages_serially(self, first_page):
+
+        """
+        Follows the @OData.nextLink chain from first_page and returns the records of every page, first_page included.
+        """
+
+        records = list(first_page['value'])
+        nextLink = first_page.get('@odata.nextLink')
+
+        while nextLink:
+
+            nextLink_response = await self._send('GET', nextLink)
+            nextLink_response.raise_for_status()
+
+            page = _loads(nextLink_response.content)
+            records.extend(page['value'])
+
+            nextLink = page.get('@odata.nextLink')
+
+        return records
+
+    async def _request_pages_concurrently(self, endpoint, params, page_offsets):
+
+        """
+        Awaits the pages described by page_offsets together and returns their records in the same order
+        the server would return them following @OData.nextLink, or None when a page comes back short,
+        see BusinessCentralAPIClient._request_pages_concurrently.
+        """
+
+        semaphore = asyncio.Semaphore(self.PAGINATION_WORKERS)
+
+        async def request_page(page_offset):
+
+            skip, top = page_offset
+
+            async with semaphore:
+
+                page_response = await self._send(
+                    'GET',
+                    endpoint,
+                    params={**params, '$skip' : skip, '$top' : top, '$count' : 'false'}
+                )
+
+            page_response.raise_for_status()
+
+            page = _loads(page_response.content)['value']
+
+            return page if len(page) == top else None
+
+        records = []
+
+        for page in await asyncio.gather(*(request_page(page_offset) for page_offset in page_offsets)):
+
+            if page is None:
+                return None
+
+            records.extend(page)
+
+        return records
+
+    async def get_customers(self,createdAt=None,modifiedAt=None,orderBy=None,select=None,offset=None,limit=None,filterExpression=None):
+
+        """get a list of customers for the specific company, see BusinessCentralAPIClient.get_customers."""
+
+        params = self.create_parameters(createdAt,modifiedAt,orderBy,select,offset,limit,filterExpression)
+
+        return await self.request(url=self.CUSTOMER_TABLE_ENDPOINT,method='GET',params=params)
+
+    async def get_products(self,createdAt=None,modifiedAt=None,orderBy=None,select=None,offset=None,limit=None,filterExpression=None):
+
+        """get a list of products for the specific company, see BusinessCentralAPIClient.get_products."""
+
+        params = self.create_parameters(createdAt,modifiedAt,orderBy,select,offset,limit,filterExpression)
+
+        return await self.request(url=self.PRODUCT_TABLE_ENDPOINT,method='GET',params=params)
+
+    async def get_customer(self,customerId):
+
+        """get information about a specific customer, see BusinessCentralAPIClient.get_customer."""
+
+        return await self.request(url=self.CUSTOMER_TABLE_ENDPOINT,method='GET',params=self._lookup_params(self.CUSTOMER_DEFAULT_SELECT, customerId))
+
+    async def get_product(self,productId):
+
+        """get information about a specific product, see BusinessCentralAPIClient.get_product."""
+
+        return await self.request(url=self.PRODUCT_TABLE_ENDPOINT,method='GET',params=self._lookup_params(self.PRODUCT_DEFAULT_SELECT, productId))
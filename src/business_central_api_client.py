@@ -1,9 +1,430 @@
 import requests
 import urllib.parse
-from msal import ConfidentialClientApplication
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from email import policy
+from email.parser import BytesParser
+from msal import ConfidentialClientApplication, SerializableTokenCache
+import copy
+import inspect
 import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Retry only accepts backoff_jitter from urllib3 2.0 on, urllib3 1.26 retries without jitter.
+_RETRY_SUPPORTS_JITTER = 'backoff_jitter' in inspect.signature(Retry).parameters
+
+class QueryTooExpensiveError(Exception):
+    """
+    Raised when the estimated cost of a 'GET' request exceeds the max_query_cost of the client.
+    """
+
+class BusinessCentralClientMixin:
+    """
+    Token handling, query parameter construction and query cost estimation shared by BusinessCentralAPIClient
+    and AsyncBusinessCentralAPIClient. Clients call _init_client from __init__ and provide a headers mapping,
+    where get_oauth_token sets the Authorization header.
+
+    Attributes:
+
+        CUSTOMER_TABLE_ENDPOINT, PRODUCT_TABLE_ENDPOINT, CUSTOMER_DEFAULT_SELECT, PRODUCT_DEFAULT_SELECT : see BusinessCentralAPIClient.
+        TOKEN_EXPIRY_MARGIN (int) : seconds before its expiry an access token is considered expired and requested again.
+        CONCURRENT_PAGINATION, PAGINATION_WORKERS, CONNECTION_POOL_SIZE : see BusinessCentralAPIClient.
+        RETRY_TOTAL, RETRY_BACKOFF_FACTOR, RETRY_BACKOFF_JITTER, RETRY_STATUSES : retry policy for throttled and failed requests.
+    """
+
+    CUSTOMER_TABLE_ENDPOINT = 'SQLCustomer'
+    PRODUCT_TABLE_ENDPOINT = 'SQLProduct'
+    CUSTOMER_DEFAULT_SELECT = None
+    PRODUCT_DEFAULT_SELECT = None
+    TOKEN_EXPIRY_MARGIN = 60
+    CONCURRENT_PAGINATION = False
+    PAGINATION_WORKERS = 8
+    CONNECTION_POOL_SIZE = 32
+    RETRY_TOTAL = 5
+    RETRY_BACKOFF_FACTOR = 0.5
+    RETRY_BACKOFF_JITTER = 0.5
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def _init_client(self, tenant_id, environment, company, client_id, client_secret, scopes, token_cache_path, timeout, max_query_cost):
+
+        """
+        Sets the credentials, URLs and token state of the client and loads the MSAL token cache.
+        """
+
+        self.tenant_id = tenant_id
+        self.environment = environment
+        self.company = company
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.scopes = scopes
+        self.base_url = f"https://api.businesscentral.dynamics.com/v2.0/{self.tenant_id}/{self.environment}/ODataV4/Company('{self.company}')/"
+        self.authority = f"https://login.microsoftonline.com/{self.tenant_id}"
+        self._endpoints = {
+            endpoint : self.base_url + endpoint
+            for endpoint in (self.CUSTOMER_TABLE_ENDPOINT, self.PRODUCT_TABLE_ENDPOINT)
+        }
+        self.access_token = None
+        self.token_type = None
+        self._token_expiry = 0
+        self.token_cache_path = token_cache_path
+        self.timeout = timeout
+        self.max_query_cost = max_query_cost
+        self._token_cache = SerializableTokenCache()
+        self.load_token_cache()
+        self._msal_app = None
+
+    def load_token_cache(self):
+
+        """
+        Loads the serialized MSAL token cache from token_cache_path, if it was provided and the file exists.
+        """
+
+        if self.token_cache_path and os.path.exists(self.token_cache_path):
+
+            with open(self.token_cache_path, 'r') as cache_file:
+
+                self._token_cache.deserialize(cache_file.read())
+
+    def save_token_cache(self):
+
+        """
+        Persists the MSAL token cache to token_cache_path when it changed.
+
+        The cache is written to a temporary file first and then moved into place, so concurrent
+        processes never read a partially written cache.
+        """
+
+        if not self.token_cache_path or not self._token_cache.has_state_changed:
+            return
+
+        cache_dir = os.path.dirname(os.path.abspath(self.token_cache_path))
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix='.token_cache_')
+
+        try:
+
+            with os.fdopen(fd, 'w') as cache_file:
+
+                cache_file.write(self._token_cache.serialize())
+
+            os.replace(tmp_path, self.token_cache_path)
+
+        except BaseException:
+
+            os.remove(tmp_path)
+            raise
+
+        self._token_cache.has_state_changed = False
+
+    def token_is_valid(self):
+
+        """
+        Returns True while the current access token is not within TOKEN_EXPIRY_MARGIN seconds of its expiry.
+        """
+
+        return self.access_token is not None and time.monotonic() < self._token_expiry
+
+    def _own_cached_tokens(self):
+
+        """
+        Returns the access tokens of the MSAL token cache issued to this client id and tenant for its scopes,
+        leaving out those of other clients or tenants sharing the same token_cache_path.
+        """
+
+        return [
+            cached_token
+            for cached_token in self._token_cache.search(SerializableTokenCache.CredentialType.ACCESS_TOKEN, target=self.scopes)
+            if cached_token.get('client_id') == self.client_id
+            and cached_token.get('realm', '').lower() == self.tenant_id.lower()
+        ]
+
+    def _cached_token_response(self):
+
+        """
+        Returns an access token of the MSAL token cache that is still valid for this client, tenant and scopes,
+        shaped like a token response from MSAL, or None when there is no such token.
+        """
+
+        now = time.time()
+
+        for cached_token in self._own_cached_tokens():
+
+            expires_in = int(cached_token.get('expires_on', 0)) - now
+
+            if expires_in > self.TOKEN_EXPIRY_MARGIN:
+
+                return {
+                    'access_token' : cached_token['secret'],
+                    'token_type' : cached_token.get('token_type', 'Bearer'),
+                    'expires_in' : expires_in
+                }
+
+        return None
+
+    def _msal_application(self):
+
+        """
+        Returns the ConfidentialClientApplication of the client, creating it on first use.
+
+        Creating it fetches the tenant metadata from Azure AD, so it is postponed until a token actually has to be requested.
+        """
+
+        if self._msal_app is None:
+
+            self._msal_app = ConfidentialClientApplication(
+                client_id=self.client_id,
+                client_credential=self.client_secret,
+                authority=self.authority,
+                token_cache=self._token_cache,
+                http_client=requests.Session()
+            )
+
+        return self._msal_app
+
+    def get_oauth_token(self):
+
+
+        """
+        Obtains an OAuth2.0 access token from Azure AD using msal library ConfidentialClientApplication class, as recommended by Microsoft.
+
+        This method handles the OAuth2.0 authentication process and retrieves an access token
+        required for making the API requests. The token is only requested again once it is about to expire,
+        and a still valid token found in the MSAL token cache is used without contacting Azure AD.
+        The ConfidentialClientApplication is only created the first time a token has to be requested and is reused afterwards.
+        """
+
+        if self.token_is_valid():
+            return
+
+        token_response = self._cached_token_response() or self._msal_application().acquire_token_for_client(scopes=self.scopes)
+
+        if 'access_token' in token_response:
+
+            self.access_token = token_response['access_token']   
+            self.token_type = token_response['token_type'] 
+            self._token_expiry = time.monotonic() + int(token_response['expires_in']) - self.TOKEN_EXPIRY_MARGIN
+            self.headers['Authorization'] = f'{self.token_type} {self.access_token}'
+            self.save_token_cache()
+
+        else:
+
+            raise Exception(f'''Unable to obtain access token with parameters provided.
+                             client_id : {self.client_id}
+                             client_secret : {self.client_secret}
+                             authority : {self.authority}''')
+        
+    def refresh_oauth_token(self):
 
-class BusinessCentralAPIClient(requests.Session):
+        """
+        Obtains a new OAuth2.0 access token once the current session token expired.
+        The access tokens cached for this client and tenant are discarded so a fresh one is requested from Azure AD,
+        tokens of other clients sharing the MSAL token cache are kept.
+        """
+
+        for cached_token in self._own_cached_tokens():
+
+            self._token_cache.remove_at(cached_token)
+
+        self._token_expiry = 0
+        self.get_oauth_token()
+
+    def _endpoint_url(self, url):
+
+        """
+        Returns the absolute URL of url, which is either already absolute or relative to base_url.
+        """
+
+        if url.startswith(('https://', 'http://')):
+
+            return url
+
+        return self.base_url + url
+
+    @classmethod
+    def estimate_query_cost(cls, params):
+
+        """
+        Returns a rough estimate of the server-side cost of a 'GET' request with the given query parameters.
+
+        Full table scans weigh the most: a request without $filter and $top adds 100, $top over 10000 adds 50,
+        $expand nested more than two levels deep adds 50, every contains() in $filter adds 10 and every and/or adds 2.
+        Quoted string literals are ignored, so 'Black and White' does not count as an and,
+        and a $top that is not a plain integer, such as a parameter alias, is not scored.
+        """
+
+        cost = 0
+        filterExpression = re.sub(r"'(?:[^']|'')*'", "''", str(params.get('$filter', '')))
+
+        if not filterExpression and '$top' not in params:
+
+            cost += 100
+
+        if str(params.get('$top', '')).isdigit() and int(params['$top']) > 10000:
+
+            cost += 50
+
+        if '$expand' in params and cls._expand_depth(str(params['$expand'])) > 2:
+
+            cost += 50
+
+        cost += 10 * filterExpression.count('contains(')
+        cost += 2 * len(re.findall(r'\b(?:and|or)\b', filterExpression))
+
+        return cost
+
+    @staticmethod
+    def _expand_depth(expand):
+
+        """
+        Returns how many levels deep the $expand option expand goes, counting the top level as 1.
+        Nested expansions such as 'a($expand=b($expand=c))' add a level per enclosing parenthesis, siblings do not.
+        """
+
+        expand = re.sub(r"'(?:[^']|'')*'", "''", expand)
+        depth = 1
+
+        for match in re.finditer(r'\$expand=', expand):
+
+            preceding = expand[:match.start()]
+            depth = max(depth, preceding.count('(') - preceding.count(')') + 1)
+
+        return depth
+
+    def check_query_cost(self, url, params):
+
+        """
+        Raises QueryTooExpensiveError when the estimated cost of params exceeds max_query_cost.
+        """
+
+        if self.max_query_cost is None:
+            return
+
+        cost = self.estimate_query_cost(params)
+
+        if cost > self.max_query_cost:
+
+            raise QueryTooExpensiveError(f'Estimated cost {cost} of the request to {url} exceeds max_query_cost {self.max_query_cost}.')
+
+    def _page_offsets(self, first_page, params):
+
+        """
+        Returns the ($skip, $top) pairs of the pages remaining after first_page, or None when they can not be predicted,
+        that is when the server did not return @odata.count or its @odata.nextLink does not use $skip.
+        """
+
+        nextLink = first_page.get('@odata.nextLink')
+        count = first_page.get('@odata.count')
+
+        if not nextLink or count is None:
+            return None
+
+        nextLink_query = urllib.parse.parse_qs(urllib.parse.urlsplit(nextLink).query)
+
+        if '$skip' not in nextLink_query or '$skiptoken' in nextLink_query:
+            return None
+
+        page_size = len(first_page['value'])
+
+        if page_size == 0:
+            return None
+
+        start = int(params.get('$skip', 0))
+        end = int(count)
+
+        if '$top' in params:
+
+            end = min(end, start + int(params['$top']))
+
+        return [(offset, min(page_size, end - offset)) for offset in range(start + page_size, end, page_size)]
+
+    def create_parameters(self,createdAt,modifiedAt,orderBy,select,offset,limit,filterExpression,extra_params=None):
+        """
+        Constructs the parameters dictionary of the specific request, 
+        using OData standard query options such as $filter, $select, $orderby, $top and $skip.
+
+        Args:
+            createdAt (datetime): The value to filter records created after a specific timestamp. 
+            (it is required that systemCreatedAt field is included on the API page to use this parameter).
+            modifiedAt (datetime): The value to filter records modified after a specific timestamp.
+            (it is required that systemModifiedAt field is included on the API page to use this parameter).
+            orderBy (str): The field of the API response to order by.
+            select (str): The fields to include in the API response.
+            offset (int): The number of records to skip in the API response.
+            limit (int): The maximum number of records to return in the API response.
+            filterExpression (str): A custom filter expression to apply to the request.
+            extra_params (dict): Additional query parameters merged into the request, such as parameter aliases (@name) referenced in filterExpression.
+
+        Returns:
+            A new dictionary with the query options of the request.
+        """
+        filters = [
+            template.format(value)
+            for template, value in (
+                ('systemCreatedAt gt {}', createdAt),
+                ('systemModifiedAt gt {}', modifiedAt),
+                ('({})', filterExpression)
+            )
+            if value
+        ]
+
+        params = {
+            option : value
+            for option, value in (
+                ('$orderby', orderBy),
+                ('$select', select),
+                ('$skip', offset),
+                ('$top', limit)
+            )
+            if value
+        }
+
+        if filters:
+
+            params['$filter'] = ' and '.join(filters)
+
+        if extra_params:
+
+            params.update(extra_params)
+
+        return params
+
+    @staticmethod
+    def odata_string(value):
+
+        """
+        Returns value as an OData string literal, enclosed in single quotes and with embedded single quotes doubled.
+        """
+
+        return "'" + str(value).replace("'", "''") + "'"
+    
+    def _lookup_params(self, select, recordId):
+
+        """
+        Returns the query parameters requesting the single record whose 'no' field equals recordId.
+        """
+
+        params = self.create_parameters(createdAt=None,modifiedAt=None,orderBy=None,select=select,offset=None,limit=1,filterExpression='no eq @id',extra_params={'@id' : self.odata_string(recordId)})
+        params['$count'] = 'false'
+
+        return params
+
+class BusinessCentralAPIClient(BusinessCentralClientMixin, requests.Session):
     """
     A class  that inherits from requests.Session class for interacting with Dynamics 365 Business Central API.
     
@@ -21,15 +442,31 @@ class BusinessCentralAPIClient(requests.Session):
         authority (str) : the authority URL required to obtain oauth token.
         access_token (str) : OAuth2.0 access token for the client, automatically retrieved when an object is initialized.
         token_type (str) : token type, automatically retrieved when an object is initialized.
+        token_cache_path (str) : path of the file used to persist the MSAL token cache across processes (optional).
+        timeout (float) : timeout in seconds applied to every request to the Business Central API (optional).
+        lookup_cache_ttl (float) : seconds a record returned by get_customer or get_product is reused before requesting it again.
+        max_query_cost (int) : highest estimated cost accepted for a 'GET' request, see estimate_query_cost (optional).
         headers (dict) : the base headers for every request to the Business Central API.
+            Accept-Encoding is left to requests, which asks for gzip and deflate compressed responses,
+            and also for br when the optional brotli package is installed (pip install brotli).
         CUSTOMER_TABLE_ENDPOINT (str) : name of the custom API page entity which exposes data from Customer Table (ID 18)
             Reference to Microsoft Documentation: https://learn.microsoft.com/en-us/dynamics365/business-central/application/base-application/table/microsoft.sales.customer.customer
         PRODUCT_TABLE_ENDPOINT (str) : name of the custom API page entity which exposes data from Item Table (ID 27)
             Reference to Microsoft Documentation: https://learn.microsoft.com/en-us/dynamics365/business-central/application/base-application/table/microsoft.inventory.item.item
+        CUSTOMER_DEFAULT_SELECT (str) : comma separated fields requested ($select) by get_customer, every field of the API page is returned when None.
+        PRODUCT_DEFAULT_SELECT (str) : comma separated fields requested ($select) by get_product, every field of the API page is returned when None.
+        CONCURRENT_PAGINATION (bool) : whether 'GET' requests ask for $count=true so the remaining pages can be fetched concurrently.
+            Off by default: it costs an extra count on the server and only pays off when the server pages with $skip,
+            Business Central ODataV4 pages with $skiptoken, which is always followed page by page.
+        PAGINATION_WORKERS (int) : maximum number of threads used to fetch the remaining pages of a 'GET' request concurrently.
+        CONNECTION_POOL_SIZE (int) : number of keep-alive connections kept per host by the mounted HTTPAdapter,
+            which also retries throttled (429) and failed (5xx) requests with jittered exponential backoff, honoring Retry-After.
+        LOOKUP_CACHE_SIZE (int) : maximum number of records kept in memory by get_customer and get_product.
+        RETRY_TOTAL, RETRY_BACKOFF_FACTOR, RETRY_BACKOFF_JITTER, RETRY_STATUSES : retry policy for throttled and failed requests.
+            RETRY_BACKOFF_JITTER needs urllib3 2.0 or later and is ignored by the sync client on older versions.
     """
 
-    CUSTOMER_TABLE_ENDPOINT = 'SQLCustomer'
-    PRODUCT_TABLE_ENDPOINT = 'SQLProduct'
+    LOOKUP_CACHE_SIZE = 1024
 
     def __init__(self, 
                  tenant_id, 
@@ -37,7 +474,11 @@ class BusinessCentralAPIClient(requests.Session):
                  company,
                  client_id,
                  client_secret,
-                 scopes=['https://api.businesscentral.dynamics.com/.default']
+                 scopes=['https://api.businesscentral.dynamics.com/.default'],
+                 token_cache_path=None,
+                 timeout=None,
+                 lookup_cache_ttl=60,
+                 max_query_cost=None
                  ):
         """
         Initializes the API Client with the necessary credentials and base URL.
@@ -48,191 +489,419 @@ class BusinessCentralAPIClient(requests.Session):
             company (str): Name of the company within the environment.
             client_id (str): The client ID of your registered Azure App.
             client_secret (str): The client secret of your registered Azure App.
+            token_cache_path (str): File where the MSAL token cache is persisted, so tokens are reused across processes. (optional)
+            timeout (float): Seconds to wait for the Business Central API before giving up, waits indefinitely by default. (optional)
+            lookup_cache_ttl (float): Seconds get_customer and get_product results are cached, 0 disables the cache. (optional)
+            max_query_cost (int): 'GET' requests whose estimated cost is higher raise QueryTooExpensiveError, no limit by default. (optional)
         """
         super().__init__()
 
-        self.tenant_id = tenant_id
-        self.environment = environment
-        self.company = company
-        self.client_id = client_id
-        self.client_secret = client_secret
-        self.scopes = scopes
-        self.base_url = f"https://api.businesscentral.dynamics.com/v2.0/{self.tenant_id}/{self.environment}/ODataV4/Company('{self.company}')/"
-        self.authority = f"https://login.microsoftonline.com/{self.tenant_id}"
-        self.access_token = None
-        self.token_type = None
-        self.get_oauth_token()
+        self.mount(
+            'https://',
+            HTTPAdapter(
+                pool_connections=self.CONNECTION_POOL_SIZE,
+                pool_maxsize=self.CONNECTION_POOL_SIZE,
+                max_retries=Retry(
+                    total=self.RETRY_TOTAL,
+                    backoff_factor=self.RETRY_BACKOFF_FACTOR,
+                    status_forcelist=self.RETRY_STATUSES,
+                    allowed_methods=['GET', 'POST', 'PATCH', 'DELETE'],
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                    **({'backoff_jitter' : self.RETRY_BACKOFF_JITTER} if _RETRY_SUPPORTS_JITTER else {})
+                )
+            )
+        )
+
+        self._init_client(tenant_id, environment, company, client_id, client_secret, scopes, token_cache_path, timeout, max_query_cost)
+        self.lookup_cache_ttl = lookup_cache_ttl
+        self._lookup_cache = {}
+        self._lookup_cache_lock = threading.Lock()
         self.headers.update(
             {
-                'Authorization': f'{self.token_type} {self.access_token}',
                 'Accept': 'application/json',
                 'Content-Type': 'application/x-www-form-urlencoded'
             }
         )
+        self.get_oauth_token()
 
-    def get_oauth_token(self):
-
+    def request(self, url, method, params=None):
 
         """
-        Obtains an OAuth2.0 access token from Azure AD using msal library ConfidentialClientApplication class, as recommended by Microsoft.
+        Extended version of request method from request.Session class, modified to handle automatic OAuth2.0 token refresh and
+        pagination for 'GET' requests using @OData.nextLink annotation as per OData standard.
 
-        This method handles the OAuth2.0 authentication process and retrieves an access token
-        required for making the API requests.
+        With CONCURRENT_PAGINATION enabled, 'GET' requests ask for the total record count ($count=true) unless params sets $count,
+        and when the server paginates with $skip the remaining pages are fetched concurrently.
+        Otherwise the @OData.nextLink chain is followed page by page.
         """
 
-        auth_client = ConfidentialClientApplication(
-        client_id=self.client_id,
-        client_credential=self.client_secret,
-        authority=self.authority
-        )   
-    
-        token_response = auth_client.acquire_token_for_client(scopes=self.scopes)
+        endpoint = self._endpoints.get(url) or self._endpoint_url(url)
 
-        if 'access_token' in token_response:
+        if method == 'GET':
 
-            self.access_token = token_response['access_token']   
-            self.token_type = token_response['token_type'] 
+            params = {'$count' : 'true', **(params or {})} if self.CONCURRENT_PAGINATION else (params or {})
+            self.check_query_cost(url, params)
 
         else:
 
-            raise Exception(f'''Unable to obtain access token with parameters provided.
-                             client_id : {self.client_id}
-                             client_secret : {self.client_secret}
-                             authority : {self.authority}''')
+            self.clear_lookup_cache()
+
+        if not self.token_is_valid():
+
+            self.get_oauth_token()
+
+        response = super().request(url=endpoint,method=method,params=params,timeout=self.timeout)
+
+        if response.status_code == 401:
+
+            self.refresh_oauth_token()
+            
+            response = super().request(url=endpoint,method=method,params=params,timeout=self.timeout)
+
         
-    def refresh_oauth_token(self):
+        response.raise_for_status()
+
+        if method == 'GET':
+
+            first_page = _loads(response.content)
+            page_offsets = self._page_offsets(first_page, params)
+
+            if page_offsets:
+
+                records = self._request_pages_concurrently(endpoint, params, page_offsets)
+
+                if records is not None:
+
+                    return first_page['value'] + records
+
+            return self._request_pages_serially(endpoint, first_page)
+
+        return _loads(response.content)
+
+    def _request_pages_serially(self, endpoint, first_page):
 
         """
-        Obtains a new OAuth2.0 access token once the current session token expired.
+        Follows the @OData.nextLink chain from first_page and returns the records of every page, first_page included.
         """
 
-        self.get_oauth_token()
+        records = list(first_page['value'])
+        nextLink = first_page.get('@odata.nextLink')
 
-    
-    def request(self, url, method, params=None):
+        settings = self.merge_environment_settings(endpoint, {}, None, None, None)
+
+        while nextLink:
+
+            page = self._request_page(nextLink, settings=settings)
+            records.extend(page['value'])
+
+            nextLink = page.get('@odata.nextLink')
+
+        return records
+
+    def _request_page(self, url, params=None, settings=None):
 
         """
-        Extended version of request method from request.Session class, modified to handle automatic OAuth2.0 token refresh and
-        pagination for 'GET' requests using @OData.nextLink annotation as per OData standard.
+        Sends the 'GET' request of a single page and returns its decoded json body.
+
+        Pagination walks can outlive the OAuth2.0 token, so a token about to expire is renewed before the request
+        and the request is retried once with a refreshed token when the server answers 401.
+        settings are the environment settings of the request, merged once by callers sending many pages.
         """
 
-        endpoint = urllib.parse.urljoin(self.base_url,url)
+        if not self.token_is_valid():
 
-        response = super().request(url=endpoint,method=method,headers=self.headers,params=params)
+            self.get_oauth_token()
 
-        if response.status_code == 401:
+        if settings is None:
+
+            settings = self.merge_environment_settings(url, {}, None, None, None)
+
+        for attempt in range(2):
+
+            page_request = self.prepare_request(requests.Request(method='GET', url=url, params=params))
+            page_response = self.send(page_request, timeout=self.timeout, **settings)
+
+            if page_response.status_code != 401 or attempt:
+                break
 
             self.refresh_oauth_token()
-            
-            response = super().request(url=endpoint,method=method,headers=self.headers,params=params)
 
-        
-        response.raise_for_status()
+        page_response.raise_for_status()
 
-        if method == 'GET':
+        return _loads(page_response.content)
+
+    def _request_pages_concurrently(self, endpoint, params, page_offsets):
 
-            nextLink = response.json().get('@odata.nextLink')
+        """
+        Fetches the pages described by page_offsets using a thread pool and returns their records in the same order
+        the server would return them following @OData.nextLink.
 
-            while nextLink:
+        Returns None when a page comes back with fewer records than requested, for example because the server uses
+        a smaller page size or the table changed since it was counted, so the caller can fall back to the serial walk.
+        """
 
-                nextLink_response = super().request(url=nextLink,method=method,headers=self.headers)
-                nextLink_response.raise_for_status()
+        settings = self.merge_environment_settings(endpoint, {}, None, None, None)
 
-                response.json()['value'].extend(nextLink_response.json()['value'])
+        def request_page(page_offset):
 
-                nextLink = nextLink_response.json().get('@odata.nextLink')
-            
-            return response.json().get('value')
+            skip, top = page_offset
+            page = self._request_page(
+                endpoint,
+                params={**params, '$skip' : skip, '$top' : top, '$count' : 'false'},
+                settings=settings
+            )['value']
+
+            return page if len(page) == top else None
+
+        records = []
+
+        with ThreadPoolExecutor(max_workers=self.PAGINATION_WORKERS) as executor:
+
+            for page in executor.map(request_page, page_offsets):
+
+                if page is None:
+                    return None
+
+                records.extend(page)
+
+        return records
+
+    def batch_get(self, requests_list):
 
-        return response.json()
-    
-    def create_parameters(self,createdAt,modifiedAt,orderBy,select,offset,limit,filterExpression):
         """
-        Constructs the parameters dictionary of the specific request, 
-        using OData standard query options such as $filter, $select, $orderby, $top and $skip.
+        Sends several 'GET' requests in a single OData $batch request, saving one round-trip per request.
 
         Args:
-            createdAt (datetime): The value to filter records created after a specific timestamp. 
-            (it is required that systemCreatedAt field is included on the API page to use this parameter).
-            modifiedAt (datetime): The value to filter records modified after a specific timestamp.
-            (it is required that systemModifiedAt field is included on the API page to use this parameter).
-            orderBy (str): The field of the API response to order by.
-            select (str): The fields to include in the API response.
-            offset (int): The number of records to skip in the API response.
-            limit (int): The maximum number of records to return in the API response.
-            filterExpression (str): A custom filter expression to apply to the request.
+            requests_list (list): (url, params) pairs, where url is an API page entity such as CUSTOMER_TABLE_ENDPOINT
+            and params a query parameters dictionary as returned by create_parameters (or None).
+
+        Returns:
+            A list with the json body of every response, in the same order as requests_list.
+            @OData.nextLink annotations are not followed inside a batch.
+
+        Every request is checked against max_query_cost before anything is sent, like request() does.
         """
-        self.params = {}
 
-        if createdAt:
+        if not requests_list:
+            return []
 
-            self.params.update(
-                {
-                    '$filter' : f'systemCreatedAt gt {createdAt}'
-                }
-            )
-        
-        if modifiedAt:
+        for url, params in requests_list:
 
-            if '$filter' in self.params:
+            self.check_query_cost(url, params or {})
 
-                self.params['$filter'] =+ f' and ()systemModifiedAt gt {modifiedAt})'
+        boundary = f'batch_{uuid.uuid4()}'
+        parts = []
 
-            else:
-                
-                self.params.update(
-                    {
-                        '$filter' : f'systemModifiedAt gt {modifiedAt}'
-                    }
-                )
+        for url, params in requests_list:
 
-        if orderBy:
+            endpoint = self._endpoints.get(url) or self._endpoint_url(url)
 
-            self.params.update(
-                {
-                    '$orderby' : f'{orderBy}'
-                }
-            )
+            if params:
 
-        if select:
-            
-            self.params.update(
-                {
-                    '$select' : f'{select}'
-                }
+                endpoint += '?' + urllib.parse.urlencode(params, quote_via=urllib.parse.quote)
+
+            parts.append(
+                f'--{boundary}\r\n'
+                'Content-Type: application/http\r\n'
+                'Content-Transfer-Encoding: binary\r\n'
+                '\r\n'
+                f'GET {requests.utils.requote_uri(endpoint)} HTTP/1.1\r\n'
+                'Accept: application/json\r\n'
+                '\r\n'
             )
 
-        if offset:
+        body = ''.join(parts) + f'--{boundary}--\r\n'
+        headers = {'Content-Type' : f'multipart/mixed; boundary={boundary}'}
 
-            self.params.update(
-                {
-                    '$skip' : f'{offset}'
-                }
-            )
-        
-        if limit:
+        if not self.token_is_valid():
 
-            self.params.update(
-                {
-                    '$top' : f'{limit}'
-                }
+            self.get_oauth_token()
 
-            )
-        
-        if filterExpression:
+        response = super().request(url=self.base_url + '$batch',method='POST',data=body.encode(),headers=headers,timeout=self.timeout)
 
-            if '$filter' in self.params:
+        if response.status_code == 401:
 
-                self.params['$filter'] =+ f' and ({filterExpression})'
+            self.refresh_oauth_token()
 
-            else:
+            response = super().request(url=self.base_url + '$batch',method='POST',data=body.encode(),headers=headers,timeout=self.timeout)
 
-                self.params.update(
-                    {
-                        '$filter':f'{filterExpression}'
-                    }
-                )
-            
+        response.raise_for_status()
+
+        return self._parse_batch_response(response)
+
+    @staticmethod
+    def _parse_batch_response(response):
+
+        """
+        Splits a multipart/mixed $batch response into the json bodies of its individual responses.
+        """
+
+        message = BytesParser(policy=policy.HTTP).parsebytes(
+            f"Content-Type: {response.headers['Content-Type']}\r\n\r\n".encode() + response.content
+        )
+        results = []
+
+        for part in message.iter_parts():
+
+            http_response = part.get_payload(decode=True)
+            head, content = re.split(rb'\r?\n\r?\n', http_response, maxsplit=1)
+            status_code = int(head.split(b' ', 2)[1])
+
+            if status_code >= 400:
+
+                raise requests.HTTPError(f'{status_code} error in $batch response: {content.decode(errors="replace")}', response=response)
+
+            results.append(_loads(content) if content.strip() else None)
+
+        return results
+
+    def iter_request(self, url, params=None):
+
+        """
+        Streaming version of a 'GET' request: returns a generator yielding the records one by one while following the
+        @OData.nextLink annotation, so large tables can be consumed without holding every page in memory.
+
+        The query cost check and the first request happen when iter_request is called, so their errors are raised right away.
+        When the ijson library is installed each page is parsed incrementally as it is downloaded,
+        otherwise every page is decoded at once before its records are yielded.
+        """
+
+        endpoint = self._endpoints.get(url) or self._endpoint_url(url)
+
+        self.check_query_cost(url, params or {})
+
+        return self._iter_pages(self._stream_get(endpoint, params))
+
+    def _stream_get(self, url, params=None):
+
+        """
+        Sends a streamed 'GET' request, obtaining a new OAuth2.0 token beforehand when the current one is about to expire
+        and retrying once with a refreshed token when the server answers 401.
+        """
+
+        if not self.token_is_valid():
+
+            self.get_oauth_token()
+
+        response = super().request(url=url,method='GET',params=params,timeout=self.timeout,stream=True)
+
+        if response.status_code == 401:
+
+            response.close()
+            self.refresh_oauth_token()
+
+            response = super().request(url=url,method='GET',params=params,timeout=self.timeout,stream=True)
+
+        if not response.ok:
+
+            response.close()
+            response.raise_for_status()
+
+        return response
+
+    def _iter_pages(self, response):
+
+        """
+        Yields the records of response and of every page reached through its @OData.nextLink chain.
+        """
+
+        while response is not None:
+
+            with response:
+
+                page = {}
+                yield from self._iter_page(response, page)
+
+            nextLink = page.get('@odata.nextLink')
+            response = self._stream_get(nextLink) if nextLink else None
+
+    def _iter_page(self, response, page):
+
+        """
+        Yields the records of a streamed response and stores the page annotations, such as @odata.nextLink, in page.
+        """
+
+        if ijson is None:
+
+            page.update(_loads(response.content))
+            yield from page.pop('value')
+            return
+
+        response.raw.decode_content = True
+        builder = None
+
+        for prefix, event, value in ijson.parse(response.raw, use_float=True):
+
+            if prefix == 'value.item' and event in ('start_map', 'start_array'):
+
+                builder = ijson.common.ObjectBuilder()
+
+            if builder is not None:
+
+                builder.event(event, value)
+
+                if prefix == 'value.item' and event in ('end_map', 'end_array'):
+
+                    yield builder.value
+                    builder = None
+
+            elif prefix == 'value.item':
+
+                yield value
+
+            elif prefix.startswith('@odata.') and event in ('string', 'number'):
+
+                page[prefix] = value
+    
+    def _cached_lookup(self, url, select, recordId):
+
+        """
+        Requests the record of the API page entity url whose 'no' field equals recordId,
+        reusing the last response for the same record while it is younger than lookup_cache_ttl seconds.
+        The cache keeps its own copy of the records, so callers are free to modify what they receive.
+        """
+
+        key = (url, select, recordId)
+
+        with self._lookup_cache_lock:
+
+            cached = self._lookup_cache.get(key)
+
+            if cached and time.monotonic() >= cached[0]:
+
+                del self._lookup_cache[key]
+                cached = None
+
+        if cached:
+
+            return copy.deepcopy(cached[1])
+
+        records = self.request(url=url,method='GET',params=self._lookup_params(select, recordId))
+
+        if self.lookup_cache_ttl:
+
+            with self._lookup_cache_lock:
+
+                self._lookup_cache.pop(key, None)
+
+                if len(self._lookup_cache) >= self.LOOKUP_CACHE_SIZE:
+
+                    del self._lookup_cache[next(iter(self._lookup_cache))]
+
+                self._lookup_cache[key] = (time.monotonic() + self.lookup_cache_ttl, copy.deepcopy(records))
+
+        return records
+
+    def clear_lookup_cache(self):
+
+        """
+        Discards every record cached by get_customer and get_product.
+        """
+
+        with self._lookup_cache_lock:
+
+            self._lookup_cache.clear()
     
     def get_customers(self,createdAt=None,modifiedAt=None,orderBy=None,select=None,offset=None,limit=None,filterExpression=None):
 
@@ -253,9 +922,9 @@ class BusinessCentralAPIClient(requests.Session):
             A list of customers from the Customer Table Entity in json format. 
         """
 
-        self.create_parameters(createdAt,modifiedAt,orderBy,select,offset,limit,filterExpression)
+        params = self.create_parameters(createdAt,modifiedAt,orderBy,select,offset,limit,filterExpression)
 
-        return self.request(url=self.CUSTOMER_TABLE_ENDPOINT,method='GET',params=self.params)
+        return self.request(url=self.CUSTOMER_TABLE_ENDPOINT,method='GET',params=params)
     
     def get_products(self,createdAt=None,modifiedAt=None,orderBy=None,select=None,offset=None,limit=None,filterExpression=None):
             
@@ -276,9 +945,9 @@ class BusinessCentralAPIClient(requests.Session):
             A list of products  on the Item Table Entity in json format. 
         """
 
-        self.create_parameters(createdAt,modifiedAt,orderBy,select,offset,limit,filterExpression)
+        params = self.create_parameters(createdAt,modifiedAt,orderBy,select,offset,limit,filterExpression)
 
-        return self.request(url=self.PRODUCT_TABLE_ENDPOINT,method='GET',params=self.params)
+        return self.request(url=self.PRODUCT_TABLE_ENDPOINT,method='GET',params=params)
     
     def get_customer(self,customerId):
 
@@ -293,7 +962,7 @@ class BusinessCentralAPIClient(requests.Session):
         
         """
 
-        return self.get_customers(filterExpression=f"no eq '{customerId}'")
+        return self._cached_lookup(self.CUSTOMER_TABLE_ENDPOINT, self.CUSTOMER_DEFAULT_SELECT, customerId)
     
     def get_product(self,productId):
 
@@ -308,7 +977,7 @@ class BusinessCentralAPIClient(requests.Session):
         
         """
 
-        return self.get_products(filterExpression=f"no eq '{productId}'")
+        return self._cached_lookup(self.PRODUCT_TABLE_ENDPOINT, self.PRODUCT_DEFAULT_SELECT, productId)
 
     
 
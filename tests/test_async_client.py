@@ -0,0 +1,131 @@
+import time
+import unittest
+from email.utils import formatdate
+from unittest import mock
+
+import httpx
+
+from src.async_business_central_api_client import AsyncBusinessCentralAPIClient
+
+
+BASE_URL = "https://api.businesscentral.dynamics.com/v2.0/tenant/production/ODataV4/Company('CRONUS')/"
+
+
+class FakeConfidentialClientApplication:
+
+    def __init__(self, **kwargs):
+
+        pass
+
+    def acquire_token_for_client(self, scopes):
+
+        return {'access_token' : 'token', 'token_type' : 'Bearer', 'expires_in' : 3600}
+
+
+def make_client(handler):
+
+    with mock.patch('src.business_central_api_client.ConfidentialClientApplication', FakeConfidentialClientApplication):
+
+        client = AsyncBusinessCentralAPIClient('tenant', 'production', 'CRONUS', 'client', 'secret', http2=False)
+
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler), headers=client.headers)
+    client.headers = client._http.headers
+
+    return client
+
+
+class SendRetryTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+
+        self.client = make_client(lambda request: self.handler(request))
+
+    async def test_throttled_request_is_retried_before_following_skiptoken(self):
+
+        requests_seen = []
+
+        def handler(request):
+
+            requests_seen.append(request)
+
+            if len(requests_seen) == 1:
+
+                return httpx.Response(429, headers={'Retry-After' : '0'})
+
+            if '$skiptoken' not in request.url.params:
+
+                return httpx.Response(200, json={
+                    'value' : [{'no' : 'C1'}, {'no' : 'C2'}],
+                    '@odata.nextLink' : BASE_URL + "SQLCustomer?$skiptoken='C2'"
+                })
+
+            return httpx.Response(200, json={'value' : [{'no' : 'C3'}]})
+
+        self.handler = handler
+
+        async with self.client as client:
+
+            records = await client.get_customers()
+
+        self.assertEqual(records, [{'no' : 'C1'}, {'no' : 'C2'}, {'no' : 'C3'}])
+        self.assertEqual(len(requests_seen), 3)
+        self.assertEqual(requests_seen[2].url.params['$skiptoken'], "'C2'")
+        self.assertEqual(requests_seen[2].headers['Authorization'], 'Bearer token')
+
+    async def test_last_throttled_response_is_returned_after_retry_total(self):
+
+        calls = []
+
+        def handler(request):
+
+            calls.append(request)
+
+            return httpx.Response(503, headers={'Retry-After' : '0'})
+
+        self.handler = handler
+
+        async with self.client as client:
+
+            with self.assertRaises(httpx.HTTPStatusError):
+
+                await client.get_customers()
+
+        self.assertEqual(len(calls), client.RETRY_TOTAL + 1)
+
+
+class RetryDelayTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.client = AsyncBusinessCentralAPIClient.__new__(AsyncBusinessCentralAPIClient)
+
+    def test_retry_after_in_seconds(self):
+
+        self.assertEqual(self.client._retry_delay(httpx.Response(429, headers={'Retry-After' : '3'}), 0), 3.0)
+
+    def test_retry_after_as_http_date(self):
+
+        retry_after = formatdate(time.time() + 30, usegmt=True)
+
+        self.assertAlmostEqual(self.client._retry_delay(httpx.Response(429, headers={'Retry-After' : retry_after}), 0), 30, delta=2)
+
+    def test_retry_after_in_the_past_does_not_wait(self):
+
+        retry_after = formatdate(time.time() - 30, usegmt=True)
+
+        self.assertEqual(self.client._retry_delay(httpx.Response(503, headers={'Retry-After' : retry_after}), 0), 0.0)
+
+    def test_exponential_backoff_without_retry_after(self):
+
+        for retry_after in (None, 'soon'):
+
+            headers = {'Retry-After' : retry_after} if retry_after else {}
+            delay = self.client._retry_delay(httpx.Response(503, headers=headers), 2)
+
+            self.assertGreaterEqual(delay, self.client.RETRY_BACKOFF_FACTOR * 4)
+            self.assertLessEqual(delay, self.client.RETRY_BACKOFF_FACTOR * 4 + self.client.RETRY_BACKOFF_JITTER)
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+import requests
+
+from src.business_central_api_client import BusinessCentralAPIClient
+
+
+BOUNDARY = 'batchresponse_0f4c0b4e'
+
+
+class FakeResponse:
+
+    def __init__(self, content):
+
+        self.headers = {'Content-Type' : f'multipart/mixed; boundary={BOUNDARY}'}
+        self.content = content
+
+
+def batch_part(status_line, body):
+
+    return (
+        f'--{BOUNDARY}\r\n'
+        'Content-Type: application/http\r\n'
+        'Content-Transfer-Encoding: binary\r\n'
+        '\r\n'
+        f'{status_line}\r\n'
+        'Content-Type: application/json; odata.metadata=minimal\r\n'
+        'OData-Version: 4.0\r\n'
+        '\r\n'
+        f'{body}\r\n'
+    )
+
+
+class ParseBatchResponseTest(unittest.TestCase):
+
+    def test_bodies_are_returned_in_request_order(self):
+
+        content = (
+            batch_part('HTTP/1.1 200 OK', '{"value":[{"no":"C1"}]}')
+            + batch_part('HTTP/1.1 200 OK', '{"value":[{"no":"P1"},{"no":"P2"}]}')
+            + f'--{BOUNDARY}--\r\n'
+        ).encode()
+
+        results = BusinessCentralAPIClient._parse_batch_response(FakeResponse(content))
+
+        self.assertEqual(results, [{'value' : [{'no' : 'C1'}]}, {'value' : [{'no' : 'P1'}, {'no' : 'P2'}]}])
+
+    def test_failed_sub_response_raises_http_error(self):
+
+        content = (
+            batch_part('HTTP/1.1 200 OK', '{"value":[]}')
+            + batch_part('HTTP/1.1 404 Not Found', '{"error":{"code":"BadRequest_NotFound"}}')
+            + f'--{BOUNDARY}--\r\n'
+        ).encode()
+
+        with self.assertRaisesRegex(requests.HTTPError, '404.*BadRequest_NotFound'):
+
+            BusinessCentralAPIClient._parse_batch_response(FakeResponse(content))
+
+    def test_empty_batch_sends_nothing(self):
+
+        client = BusinessCentralAPIClient.__new__(BusinessCentralAPIClient)
+
+        self.assertEqual(client.batch_get([]), [])
+
+
+if __name__ == '__main__':
+
+    unittest.main()
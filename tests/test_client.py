@@ -0,0 +1,312 @@
+import gzip
+import io
+import json
+import unittest
+import urllib.parse
+from unittest import mock
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3 import HTTPResponse
+
+import src.business_central_api_client as business_central_api_client
+from src.business_central_api_client import BusinessCentralAPIClient
+
+
+BASE_URL = "https://api.businesscentral.dynamics.com/v2.0/tenant/production/ODataV4/Company('CRONUS')/"
+
+
+class FakeConfidentialClientApplication:
+
+    def __init__(self, **kwargs):
+
+        pass
+
+    def acquire_token_for_client(self, scopes):
+
+        return {'access_token' : 'token', 'token_type' : 'Bearer', 'expires_in' : 3600}
+
+
+class FakeAdapter(BaseAdapter):
+
+    """
+    Answers every request with handler(request), which returns a status code and a JSON body,
+    gzip compressing the body so responses go through the same decoding as real ones.
+    """
+
+    def __init__(self, handler):
+
+        super().__init__()
+
+        self.handler = handler
+        self.requests = []
+
+    def send(self, request, **kwargs):
+
+        self.requests.append(request)
+
+        status, body = self.handler(request)
+        raw = HTTPResponse(
+            body=io.BytesIO(gzip.compress(json.dumps(body).encode())),
+            headers={'Content-Type' : 'application/json', 'Content-Encoding' : 'gzip'},
+            status=status,
+            preload_content=False,
+            decode_content=False
+        )
+
+        return HTTPAdapter().build_response(request, raw)
+
+    def close(self):
+
+        pass
+
+
+def make_client(handler, client_class=BusinessCentralAPIClient, **kwargs):
+
+    with mock.patch.object(business_central_api_client, 'ConfidentialClientApplication', FakeConfidentialClientApplication):
+
+        client = client_class('tenant', 'production', 'CRONUS', 'client', 'secret', **kwargs)
+
+    client.adapter = FakeAdapter(handler)
+    client.mount('https://', client.adapter)
+
+    return client
+
+
+def skiptoken_pages(request):
+
+    if '$skiptoken' not in request.url:
+
+        return 200, {'value' : [{'no' : 'C1', 'balance' : 1.5}, {'no' : 'C2', 'tags' : ['a']}], '@odata.nextLink' : BASE_URL + "SQLCustomer?$skiptoken='C2'"}
+
+    return 200, {'value' : [{'no' : 'C3'}]}
+
+
+def skip_pages(table, page_size=3):
+
+    """
+    Returns a handler paging table with $skip the way a plain OData server does, reporting @odata.count when asked.
+    """
+
+    def handler(request):
+
+        query = {name : values[0] for name, values in urllib.parse.parse_qs(urllib.parse.urlsplit(request.url).query).items()}
+        skip = int(query.get('$skip', 0))
+        top = int(query.get('$top', page_size))
+        page = {'value' : table[skip:skip + min(top, page_size)]}
+
+        if query.get('$count') == 'true':
+
+            page['@odata.count'] = len(table)
+
+        if '$top' not in query and skip + page_size < len(table):
+
+            page['@odata.nextLink'] = BASE_URL + f'SQLCustomer?$skip={skip + page_size}'
+
+        return 200, page
+
+    return handler
+
+
+class ConcurrentPaginationClient(BusinessCentralAPIClient):
+
+    CONCURRENT_PAGINATION = True
+
+
+class PageOffsetsTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.client = BusinessCentralAPIClient.__new__(BusinessCentralAPIClient)
+
+    def first_page(self, nextLink, count=10):
+
+        return {'value' : [{}, {}, {}], '@odata.count' : count, '@odata.nextLink' : nextLink}
+
+    def test_remaining_pages_follow_the_first_page(self):
+
+        offsets = self.client._page_offsets(self.first_page(BASE_URL + 'SQLCustomer?$skip=3'), {})
+
+        self.assertEqual(offsets, [(3, 3), (6, 3), (9, 1)])
+
+    def test_top_and_skip_bound_the_remaining_pages(self):
+
+        offsets = self.client._page_offsets(self.first_page(BASE_URL + 'SQLCustomer?$skip=5'), {'$skip' : 2, '$top' : 7})
+
+        self.assertEqual(offsets, [(5, 3), (8, 1)])
+
+    def test_unpredictable_pages_are_not_sliced(self):
+
+        self.assertIsNone(self.client._page_offsets(self.first_page(BASE_URL + "SQLCustomer?$skiptoken='C3'"), {}))
+        self.assertIsNone(self.client._page_offsets(self.first_page(BASE_URL + 'SQLCustomer?$skip=3', count=None), {}))
+        self.assertIsNone(self.client._page_offsets({'value' : [{}], '@odata.count' : 1}, {}))
+
+
+class ConcurrentPaginationTest(unittest.TestCase):
+
+    def test_remaining_pages_are_fetched_as_slices(self):
+
+        table = [{'no' : f'C{number}'} for number in range(10)]
+        client = make_client(skip_pages(table), ConcurrentPaginationClient)
+
+        self.assertEqual(client.get_customers(), table)
+        self.assertEqual(len(client.adapter.requests), 4)
+        self.assertTrue(all('%24top=' in request.url for request in client.adapter.requests[1:]))
+
+    def test_short_slice_falls_back_to_the_serial_walk(self):
+
+        table = [{'no' : f'C{number}'} for number in range(10)]
+        handler = skip_pages(table)
+
+        def shrinking_table(request):
+
+            response = handler(request)
+
+            if '%24count=true' in request.url:
+
+                del table[4]
+
+            return response
+
+        client = make_client(shrinking_table, ConcurrentPaginationClient)
+
+        records = client.get_customers()
+
+        self.assertEqual([record['no'] for record in records], ['C0', 'C1', 'C2', 'C3', 'C5', 'C6', 'C7', 'C8', 'C9'])
+        self.assertNotIn('%24top=', client.adapter.requests[-1].url)
+
+
+class CreateParametersTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.client = BusinessCentralAPIClient.__new__(BusinessCentralAPIClient)
+
+    def test_filters_are_joined_with_and(self):
+
+        params = self.client.create_parameters('2024-01-01T00:00:00Z', '2024-02-01T00:00:00Z', None, None, None, None, "no eq 'C1' or no eq 'C2'")
+
+        self.assertEqual(
+            params['$filter'],
+            "systemCreatedAt gt 2024-01-01T00:00:00Z and systemModifiedAt gt 2024-02-01T00:00:00Z and (no eq 'C1' or no eq 'C2')"
+        )
+
+    def test_single_filter_is_not_prefixed(self):
+
+        params = self.client.create_parameters(None, '2024-02-01T00:00:00Z', 'no', 'no,name', 20, 10, None)
+
+        self.assertEqual(params, {
+            '$orderby' : 'no',
+            '$select' : 'no,name',
+            '$skip' : 20,
+            '$top' : 10,
+            '$filter' : 'systemModifiedAt gt 2024-02-01T00:00:00Z'
+        })
+
+    def test_no_filter_without_filter_arguments(self):
+
+        self.assertEqual(self.client.create_parameters(None, None, None, None, None, None, None), {})
+
+    def test_lookup_uses_a_parameter_alias(self):
+
+        params = self.client._lookup_params(None, "O'Brien")
+
+        self.assertEqual(params, {'$top' : 1, '$filter' : '(no eq @id)', '@id' : "'O''Brien'", '$count' : 'false'})
+
+
+class EstimateQueryCostTest(unittest.TestCase):
+
+    def test_expand_depth(self):
+
+        self.assertEqual(BusinessCentralAPIClient._expand_depth('salesLines,customer'), 1)
+        self.assertEqual(BusinessCentralAPIClient._expand_depth('salesLines($expand=item),customer($expand=contacts)'), 2)
+        self.assertEqual(BusinessCentralAPIClient._expand_depth('salesLines($expand=item($expand=picture))'), 3)
+        self.assertEqual(BusinessCentralAPIClient._expand_depth("salesLines($filter=description eq '($expand=x'),customer"), 1)
+
+    def test_full_table_scan(self):
+
+        self.assertEqual(BusinessCentralAPIClient.estimate_query_cost({}), 100)
+        self.assertEqual(BusinessCentralAPIClient.estimate_query_cost({'$top' : 20000}), 50)
+
+    def test_deep_expand(self):
+
+        params = {'$top' : 10, '$expand' : 'salesLines($expand=item($expand=picture))'}
+
+        self.assertEqual(BusinessCentralAPIClient.estimate_query_cost(params), 50)
+        self.assertEqual(BusinessCentralAPIClient.estimate_query_cost({**params, '$expand' : 'salesLines($expand=item),customer'}), 0)
+
+    def test_filter_operators_outside_string_literals(self):
+
+        params = {'$filter' : "contains(name, 'Black and White') or city eq 'Oslo or Bergen'"}
+
+        self.assertEqual(BusinessCentralAPIClient.estimate_query_cost(params), 12)
+
+    def test_top_alias_is_not_scored(self):
+
+        self.assertEqual(BusinessCentralAPIClient.estimate_query_cost({'$top' : '@top', '@top' : '50000'}), 0)
+
+    def test_too_expensive_query_is_not_sent(self):
+
+        client = make_client(skip_pages([]), max_query_cost=50)
+
+        with self.assertRaises(business_central_api_client.QueryTooExpensiveError):
+
+            client.get_customers()
+
+        self.assertEqual(client.adapter.requests, [])
+
+
+class LookupCacheTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.client = make_client(lambda request: (200, {'value' : [{'no' : 'C1', 'tags' : ['a']}]}))
+
+    def test_lookup_is_served_from_a_copy(self):
+
+        customer = self.client.get_customer('C1')
+        customer[0]['tags'].append('b')
+
+        self.assertEqual(self.client.get_customer('C1'), [{'no' : 'C1', 'tags' : ['a']}])
+        self.assertEqual(len(self.client.adapter.requests), 1)
+
+    def test_expired_lookup_is_requested_again(self):
+
+        self.client.get_customer('C1')
+
+        with mock.patch.object(business_central_api_client.time, 'monotonic', return_value=business_central_api_client.time.monotonic() + 3600):
+
+            self.client.lookup_cache_ttl = 0
+            self.client.get_customer('C1')
+
+        self.assertEqual(len(self.client.adapter.requests), 2)
+        self.assertEqual(self.client._lookup_cache, {})
+
+
+class IterRequestTest(unittest.TestCase):
+
+    def test_records_of_every_page_are_streamed(self):
+
+        client = make_client(skiptoken_pages)
+
+        records = list(client.iter_request(client.CUSTOMER_TABLE_ENDPOINT))
+
+        self.assertEqual(records, [{'no' : 'C1', 'balance' : 1.5}, {'no' : 'C2', 'tags' : ['a']}, {'no' : 'C3'}])
+        self.assertEqual(len(client.adapter.requests), 2)
+
+    @unittest.skipIf(business_central_api_client.ijson is None, 'ijson is not installed')
+    def test_records_are_parsed_incrementally_with_ijson(self):
+
+        client = make_client(skiptoken_pages)
+
+        with mock.patch.object(business_central_api_client, '_loads', side_effect=AssertionError('page decoded at once')):
+
+            records = list(client.iter_request(client.CUSTOMER_TABLE_ENDPOINT))
+
+        self.assertEqual(records, [{'no' : 'C1', 'balance' : 1.5}, {'no' : 'C2', 'tags' : ['a']}, {'no' : 'C3'}])
+        self.assertIn("$skiptoken='C2'", requests.utils.unquote(client.adapter.requests[1].url))
+
+
+if __name__ == '__main__':
+
+    unittest.main()